@@ -4,18 +4,52 @@ import json
 import csv
 import time
 import random
+import itertools
 import aiohttp
+import aiofiles
 import os
-from urllib.parse import urljoin, urlparse
+import socket
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 from playwright.async_api import async_playwright
-from collections import deque
+from collections import Counter
 from pathlib import Path
 import logging
 from typing import Set, Dict, List
 import subprocess
+from hashlib import blake2b
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import ahocorasick  # pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import pypdfium2 as pdfium  # in-process PDF text, no pdftotext fork
+except ImportError:
+    pdfium = None
+
+try:
+    import docx  # python-docx
+except ImportError:
+    docx = None
+
+try:
+    import ijson  # streaming crt.sh parse
+except ImportError:
+    ijson = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser  # C-backed link extraction
+except ImportError:
+    HTMLParser = None
 
 # =============== DEPENDENCIES ===============
-# pip install playwright asyncio aiohttp openpyxl python-docx PyPDF2
+# pip install playwright asyncio aiohttp aiofiles xlsxwriter python-docx PyPDF2
+# optional: pip install pyahocorasick  (single-pass keyword classifier)
+# optional: pip install pypdfium2  (in-process PDF text extraction)
+# optional: pip install selectolax  (DOM link extraction instead of href regex)
+# optional: pip install ijson  (stream crt.sh JSON instead of loading it whole)
 # playwright install chromium
 # sudo apt install tor poppler-utils antiword
 
@@ -23,9 +57,35 @@ import subprocess
 MAX_PAGES = 1000
 MAX_SUBDOMAINS = 30
 CONCURRENT = 25
-DELAY = (0.3, 1.2)
+DELAY = (0.3, 1.2)  # jittered gap between requests to the same host
+HOST_CONCURRENT = 8  # pacing lanes per host (requests to one host allowed within each DELAY gap)
 TIMEOUT = 8
 OUTPUT_DIR = "recon_reports"
+FAST_MIN_BYTES = 2000  # smaller static bodies are treated as JS shells
+JS_CHALLENGE_MARKERS = (b"challenge-platform", b"jschl")
+DOC_CONCURRENT = 8  # downloads get their own budget so they can't starve page fetches
+RESOLVE_CONCURRENT = 50  # in-flight DNS lookups while vetting candidate subdomains
+RESOLVE_TIMEOUT = 3
+MAX_DOC_BYTES = 50 * 1024 * 1024
+DOC_CHUNK = 64 * 1024
+DOCUMENT_EXTENSIONS = {'.pdf', '.doc', '.docx', '.ppt', '.pptx'}
+
+# Link hygiene: never enqueue static assets, drop click-tracking query keys
+SKIP_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.svg', '.ico', '.webp', '.css', '.js',
+                   '.woff', '.woff2', '.ttf', '.eot', '.mp3', '.mp4', '.zip'}
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref'}
+
+# One pre-warmed browser context per UA, rotated round-robin
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+)
+STEALTH_JS = """
+    delete navigator.__proto__.webdriver;
+    window.chrome = {runtime: {}};
+    Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
+"""
 
 # AI Keywords for role classification
 SENIORITY_KEYWORDS = {
@@ -43,6 +103,63 @@ DEPT_KEYWORDS = {
     "Admin": ["admission", "registrar", "finance", "hr", "library", "accounts"]
 }
 
+# Precompiled hot-path patterns (applied to every fetched page)
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+HREF_RE = re.compile(r'''href=['"]?([^'" >]+)''')
+WS_RE = re.compile(r'\s+')
+NAME_SPLIT_RE = re.compile(r'[._-]')
+# Byte twins for the static fast path: emails/links are ASCII, so raw bodies skip the decode
+EMAIL_RE_B = re.compile(EMAIL_RE.pattern.encode())
+HREF_RE_B = re.compile(HREF_RE.pattern.encode())
+
+# =============== DOCUMENT TEXT ===============
+def _extract_doc_text(filepath: str) -> str:
+    """Pull plain text out of a downloaded document, in-process where possible"""
+    if filepath.endswith('.pdf'):
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(filepath)
+            try:
+                return "\n".join(page.get_textpage().get_text_range() for page in pdf)
+            finally:
+                pdf.close()
+        result = subprocess.run(['pdftotext', '-layout', filepath, '-'],
+                                capture_output=True, text=True)
+        return result.stdout
+    
+    if filepath.endswith('.docx') and docx is not None:
+        document = docx.Document(filepath)
+        parts = [p.text for p in document.paragraphs]
+        for table in document.tables:
+            for row in table.rows:
+                parts.extend(cell.text for cell in row.cells)
+        return "\n".join(parts)
+    
+    result = subprocess.run(['strings', filepath], capture_output=True, text=True)
+    return result.stdout
+
+def _is_target_domain(email: str, base_domain: str) -> bool:
+    if '@' not in email:
+        return False
+    domain = email.rpartition('@')[2].lower()
+    return domain == base_domain or domain.endswith('.' + base_domain)
+
+def _extract_emails_sync(filepath: str, base_domain: str) -> Set[str]:
+    """Document → target-domain emails; module-level so it pickles into the process pool"""
+    emails = set()
+    try:
+        text = _extract_doc_text(filepath)
+        for email in EMAIL_RE.findall(text):
+            if _is_target_domain(email, base_domain):
+                emails.add(email.lower())
+    except:
+        pass
+    return emails
+
+def _write_one(item):
+    path, content = item
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
 # =============== KING INTELLIGENCE CORE ===============
 class KingHarvester:
     def __init__(self, root_url: str):
@@ -51,36 +168,73 @@ class KingHarvester:
         if self.base_domain.startswith('www.'):
             self.base_domain = self.base_domain[4:]
         
+        # Domain suffixes precomputed for the per-match email filter
+        self._dot_domain = '.' + self.base_domain
+        self._base_b = self.base_domain.encode()
+        self._dot_b = self._dot_domain.encode()
+        
         # Intelligence database
         self.profiles: Dict[str, Dict] = {}  # email -> full intel
         self.visited: Set[str] = set()
         self.documents: Set[str] = set()
+        self._pending_dossiers: List[tuple] = []  # (path, text) written in finalize
         self.pages = 0
         self.session = None
         self.browser = None
+        self.contexts = []
+        self._ctx_cycle = None
+        self._browser_lock = asyncio.Lock()
+        self._doc_sem = asyncio.Semaphore(DOC_CONCURRENT)
+        self._resolve_sem = asyncio.Semaphore(RESOLVE_CONCURRENT)
+        self._host_lanes: Dict[str, List[float]] = {}  # host -> monotonic time each pacing lane frees up
+        self._parked: Dict[str, asyncio.TimerHandle] = {}  # url -> timer that requeues it when its slot opens
+        self._doc_pool = ProcessPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2))
+        
+        # Keyword automaton (built once, scanned once per page)
+        self._ac = self._build_keyword_automaton()
         
         # Create output dir
         self.out_dir = Path(OUTPUT_DIR) / f"{self.base_domain}_{int(time.time())}"
         self.out_dir.mkdir(parents=True, exist_ok=True)
+        # Downloaded documents are shared by every run against this domain
+        self.doc_cache_dir = Path(OUTPUT_DIR) / "_doc_cache" / self.base_domain
+        self.doc_cache_dir.mkdir(parents=True, exist_ok=True)
 
     # ==================== AI CLASSIFIER ====================
-    def classify_profile(self, text: str, email: str) -> Dict:
-        """AI-powered role/seniority/department prediction"""
-        # Clean text
-        clean_text = re.sub(r'\s+', ' ', text.lower())
+    def _build_keyword_automaton(self):
+        """Compile every classifier keyword into one Aho-Corasick automaton"""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for bucket, table in (("seniority", SENIORITY_KEYWORDS), ("dept", DEPT_KEYWORDS)):
+            for label, keywords in table.items():
+                for kw in keywords:
+                    automaton.add_word(kw, (bucket, label, kw))
+        automaton.make_automaton()
+        return automaton
+
+    def _analyze_page(self, text: str) -> Dict:
+        """Page-level classifier work, done once and shared by every email on the page"""
+        lower = text.lower()
+        clean_text = WS_RE.sub(' ', lower)
         
-        # Name extraction (heuristic)
-        name = ""
-        email_local = email.split('@')[0]
-        name_parts = re.split(r'[._-]', email_local)
-        if len(name_parts) >= 2 and all(len(p) > 1 for p in name_parts[:2]):
-            name = " ".join(p.capitalize() for p in name_parts[:2])
+        if self._ac is not None:
+            hits = {"seniority": set(), "dept": set()}
+            for _, (bucket, label, kw) in self._ac.iter(clean_text):
+                hits[bucket].add((label, kw))
+            seniority_scores = Counter(label for label, _ in hits["seniority"])
+            dept_scores = Counter(label for label, _ in hits["dept"])
+        else:
+            seniority_scores = {level: sum(1 for kw in keywords if kw in clean_text)
+                                for level, keywords in SENIORITY_KEYWORDS.items()}
+            dept_scores = {dept: sum(1 for kw in keywords if kw in clean_text)
+                           for dept, keywords in DEPT_KEYWORDS.items()}
         
         # Seniority classification
         seniority = "unknown"
         max_score = 0
-        for level, keywords in SENIORITY_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in clean_text)
+        for level in SENIORITY_KEYWORDS:
+            score = seniority_scores.get(level, 0)
             if score > max_score:
                 max_score = score
                 seniority = level
@@ -88,12 +242,37 @@ class KingHarvester:
         # Department classification
         department = "General"
         dept_score = 0
-        for dept, keywords in DEPT_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in clean_text)
+        for dept in DEPT_KEYWORDS:
+            score = dept_scores.get(dept, 0)
             if score > dept_score:
                 dept_score = score
                 department = dept
         
+        return {
+            "clean_text": clean_text,
+            "seniority_scores": seniority_scores,
+            "dept_scores": dept_scores,
+            "seniority": seniority,
+            "seniority_score": max_score,
+            "department": department,
+            "dept_score": dept_score,
+            "html": text,
+            "lower": lower,
+            "snippets": {}
+        }
+
+    def _classify_email(self, page_ctx: Dict, email: str) -> Dict:
+        """Per-email work: name heuristic, confidence and snippet"""
+        # Name extraction (heuristic)
+        name = ""
+        email_local = email.split('@')[0]
+        name_parts = NAME_SPLIT_RE.split(email_local)
+        if len(name_parts) >= 2 and all(len(p) > 1 for p in name_parts[:2]):
+            name = " ".join(p.capitalize() for p in name_parts[:2])
+        
+        seniority = page_ctx["seniority"]
+        department = page_ctx["department"]
+        
         # Confidence score (0.0 - 1.0)
         confidence = 0.3  # baseline
         if name:
@@ -102,7 +281,7 @@ class KingHarvester:
             confidence += 0.15
         if department != "General":
             confidence += 0.15
-        if max_score + dept_score > 2:
+        if page_ctx["seniority_score"] + page_ctx["dept_score"] > 2:
             confidence += 0.2
         
         return {
@@ -110,17 +289,28 @@ class KingHarvester:
             "seniority": seniority,
             "department": department,
             "confidence": min(confidence, 0.95),
-            "raw_snippet": self._get_snippet(text, email)
+            "raw_snippet": self._get_snippet(page_ctx, email)
         }
 
-    def _get_snippet(self, text: str, email: str) -> str:
-        """Extract 200-char context around email"""
-        lines = text.split('\n')
-        for line in lines:
-            if email in line.lower():
-                start = max(0, line.lower().index(email) - 100)
-                return line[start:start+200].strip()
-        return "Context not found"
+    def _get_snippet(self, page_ctx: Dict, email: str) -> str:
+        """Extract 200-char context around email (clipped to its line)"""
+        snippets = page_ctx["snippets"]
+        if email in snippets:
+            return snippets[email]
+        
+        lower = page_ctx["lower"]
+        idx = lower.find(email)
+        if idx < 0:
+            snippet = "Context not found"
+        else:
+            line_start = lower.rfind('\n', 0, idx) + 1
+            line_end = lower.find('\n', idx)
+            if line_end < 0:
+                line_end = len(lower)
+            start = max(line_start, idx - 100)
+            snippet = page_ctx["html"][start:min(start + 200, line_end)].strip()
+        snippets[email] = snippet
+        return snippet
 
     # ==================== DEEP DISCOVERY ENGINE ====================
     async def discover_subdomains(self) -> List[str]:
@@ -130,11 +320,13 @@ class KingHarvester:
             url = f"https://crt.sh/?q=%25.{self.base_domain}&output=json"
             async with self.session.get(url) as resp:
                 if resp.status == 200:
-                    data = await resp.json(content_type=None)
-                    for entry in data:
-                        name = entry.get('name_value', '').lower().strip()
-                        if name and name.endswith(self.base_domain) and '*' not in name:
-                            subdomains.add(f"https://{name}")
+                    if ijson is not None:
+                        # crt.sh answers can be tens of MB; parse entry by entry
+                        async for entry in ijson.items_async(resp.content, 'item'):
+                            self._add_cert_names(subdomains, entry)
+                    else:
+                        for entry in await resp.json(content_type=None):
+                            self._add_cert_names(subdomains, entry)
         except:
             pass
         
@@ -147,45 +339,77 @@ class KingHarvester:
         for sub in tactical_subs:
             subdomains.add(f"https://{sub}.{self.base_domain}")
         
-        return list(subdomains)[:MAX_SUBDOMAINS]
+        # Drop names that don't resolve before each one costs a full browser timeout;
+        # lookups are bounded and stop once MAX_SUBDOMAINS live hosts are found
+        tasks = [asyncio.create_task(self._resolves(u)) for u in subdomains]
+        alive = []
+        try:
+            for done in asyncio.as_completed(tasks):
+                url = await done
+                if url:
+                    alive.append(url)
+                    if len(alive) >= MAX_SUBDOMAINS:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return alive
+
+    def _add_cert_names(self, subdomains: Set[str], entry: Dict):
+        """A crt.sh entry may carry several newline-separated names"""
+        for name in entry.get('name_value', '').lower().split('\n'):
+            name = name.strip()
+            if name and name.endswith(self.base_domain) and '*' not in name:
+                subdomains.add(f"https://{name}")
+
+    async def _resolves(self, url: str) -> str:
+        """The url back if its host resolves within RESOLVE_TIMEOUT, empty string otherwise"""
+        async with self._resolve_sem:
+            try:
+                await asyncio.wait_for(
+                    asyncio.get_running_loop().getaddrinfo(urlparse(url).netloc, 443, type=socket.SOCK_STREAM),
+                    RESOLVE_TIMEOUT)
+                return url
+            except Exception:
+                return ""
 
     # ==================== DOCUMENT MINER ====================
     async def download_document(self, url: str) -> str:
-        """Download and save document"""
-        try:
-            async with self.session.get(url) as resp:
-                if resp.status == 200:
-                    ext = Path(urlparse(url).path).suffix.lower()
-                    if ext in {'.pdf', '.doc', '.docx', '.ppt', '.pptx'}:
-                        filename = self.out_dir / f"doc_{abs(hash(url))}{ext}"
-                        with open(filename, 'wb') as f:
-                            f.write(await resp.read())
+        """Stream document to disk (skips anything over MAX_DOC_BYTES, reuses cached copies)"""
+        ext = Path(urlparse(url).path).suffix.lower()
+        if ext not in DOCUMENT_EXTENSIONS:
+            return ""
+        # Stable name across runs, unlike the per-process randomized hash()
+        filename = self.doc_cache_dir / f"doc_{blake2b(url.encode(), digest_size=8).hexdigest()}{ext}"
+        if filename.exists() and filename.stat().st_size > 0:
+            return str(filename)
+        
+        # Stream into a .part file and rename when complete, so a killed run
+        # never leaves a truncated file that later runs take as cached
+        part = filename.with_name(filename.name + ".part")
+        async with self._doc_sem:
+            try:
+                async with self.session.get(url) as resp:
+                    if resp.status == 200:
+                        if (resp.content_length or 0) > MAX_DOC_BYTES:
+                            return ""
+                        size = 0
+                        async with aiofiles.open(part, 'wb') as f:
+                            async for chunk in resp.content.iter_chunked(DOC_CHUNK):
+                                size += len(chunk)
+                                if size > MAX_DOC_BYTES:
+                                    break
+                                await f.write(chunk)
+                        if size > MAX_DOC_BYTES:
+                            part.unlink(missing_ok=True)
+                            return ""
+                        os.replace(part, filename)
                         return str(filename)
-        except:
-            pass
+            except Exception:
+                part.unlink(missing_ok=True)
         return ""
 
-    def extract_emails_from_doc(self, filepath: str) -> Set[str]:
-        """Extract emails from documents"""
-        emails = set()
-        try:
-            text = ""
-            if filepath.endswith('.pdf'):
-                result = subprocess.run(['pdftotext', '-layout', filepath, '-'], 
-                                      capture_output=True, text=True)
-                text = result.stdout
-            else:
-                result = subprocess.run(['strings', filepath], capture_output=True, text=True)
-                text = result.stdout
-            
-            std_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-            for email in std_emails:
-                if self.is_target_domain(email):
-                    emails.add(email.lower())
-        except:
-            pass
-        return emails
-
     # ==================== STEALTH BROWSER ====================
     async def init_browser(self):
         pw = await async_playwright().start()
@@ -202,25 +426,46 @@ class KingHarvester:
                 "--disable-plugins"
             ]
         )
-
-    async def fetch_with_evasion(self, url: str) -> str:
-        if not self.browser:
-            await self.init_browser()
-        
-        for attempt in range(2):
-            context = await self.browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        # Long-lived contexts; only pages are opened/closed per fetch
+        for ua in USER_AGENTS:
+            ctx = await self.browser.new_context(
+                user_agent=ua,
                 viewport={"width": 1920, "height": 1080},
                 locale="en-US",
                 timezone_id="America/New_York"
             )
-            await context.add_init_script("""
-                delete navigator.__proto__.webdriver;
-                window.chrome = {runtime: {}};
-                Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
-            """)
-            
-            page = await context.new_page()
+            await ctx.add_init_script(STEALTH_JS)
+            self.contexts.append(ctx)
+        self._ctx_cycle = itertools.cycle(self.contexts)
+
+    def _pace(self, url: str) -> float:
+        """Per-host politeness: reserve the host's earliest free lane, return seconds until it opens"""
+        lanes = self._host_lanes.setdefault(urlparse(url).netloc, [0.0] * HOST_CONCURRENT)
+        now = time.monotonic()
+        lane = min(range(HOST_CONCURRENT), key=lanes.__getitem__)
+        slot = max(now, lanes[lane])
+        lanes[lane] = slot + random.uniform(*DELAY)
+        return slot - now
+
+    async def fetch_fast(self, url: str):
+        """Plain HTTP fetch of the raw body; None when the page needs a real browser"""
+        try:
+            async with self.session.get(url, allow_redirects=True) as resp:
+                if resp.status == 200 and 'text/html' in resp.headers.get('Content-Type', ''):
+                    body = await resp.read()
+                    if len(body) > FAST_MIN_BYTES and not any(m in body for m in JS_CHALLENGE_MARKERS):
+                        return body
+        except Exception:
+            pass
+        return None
+
+    async def fetch_with_evasion(self, url: str) -> str:
+        async with self._browser_lock:
+            if not self.browser:
+                await self.init_browser()
+        
+        for attempt in range(2):
+            page = await next(self._ctx_cycle).new_page()
             try:
                 await page.goto(url, wait_until="domcontentloaded", timeout=TIMEOUT*1000)
                 await page.wait_for_timeout(random.uniform(1000, 2500))
@@ -228,43 +473,79 @@ class KingHarvester:
             except:
                 pass
             finally:
-                await context.close()
+                await page.close()
             await asyncio.sleep(2)
         return ""
 
     # ==================== CORE INTELLIGENCE GATHERING ====================
-    def is_target_domain(self, email: str) -> bool:
-        if '@' not in email:
-            return False
-        _, domain = email.lower().rsplit('@', 1)
-        return domain == self.base_domain or domain.endswith('.' + self.base_domain)
-
-    def extract_and_clean_emails(self, text: str) -> Set[str]:
+    def extract_and_clean_emails(self, html) -> Set[str]:
+        """Target-domain emails from a page (str, or raw bytes from fetch_fast)"""
         emails = set()
-        # Standard emails
-        std_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        for email in std_emails:
-            if self.is_target_domain(email):
-                emails.add(email.lower())
+        # Standard emails: lowercase each match once, then an inline suffix test
+        if isinstance(html, bytes):
+            base, dot_base = self._base_b, self._dot_b
+            for m in EMAIL_RE_B.finditer(html):
+                email = m.group().lower()
+                domain = email.rpartition(b'@')[2]
+                if domain == base or domain.endswith(dot_base):
+                    emails.add(email.decode('ascii'))
+        else:
+            base, dot_base = self.base_domain, self._dot_domain
+            for m in EMAIL_RE.finditer(html):
+                email = m.group().lower()
+                domain = email.rpartition('@')[2]
+                if domain == base or domain.endswith(dot_base):
+                    emails.add(email)
         # Add de-obfuscation if needed
         return emails
 
+    def _extract_hrefs(self, html) -> List[str]:
+        """All <a href> values from str or raw-bytes HTML, in one parse"""
+        if HTMLParser is not None:
+            tree = HTMLParser(html)
+            hrefs = (node.attributes.get('href') for node in tree.css('a[href]'))
+            return [href.strip() for href in hrefs if href]
+        if isinstance(html, bytes):
+            return [m.decode('utf-8', 'ignore') for m in HREF_RE_B.findall(html)]
+        return HREF_RE.findall(html)
+
+    def _canon(self, url: str) -> str:
+        """Dedup key only: lowercase host, no fragment/tracking keys/trailing slash.
+        Pages are still fetched and joined against the URL as linked."""
+        parts = urlsplit(url)
+        query = '&'.join(p for p in parts.query.split('&')
+                         if p.partition('=')[0] not in TRACKING_PARAMS and not p.startswith('utm_'))
+        path = parts.path.rstrip('/') or '/'
+        return urlunsplit((parts.scheme, parts.netloc.lower(), path, query, ''))
+
+    def _claim(self, url: str) -> bool:
+        """Mark a URL's canonical key as visited; False if it already was (one set op, no await)"""
+        before = len(self.visited)
+        self.visited.add(self._canon(url))
+        return len(self.visited) != before
+
     async def scrape_page(self, url: str):
-        if url in self.visited or self.pages >= MAX_PAGES:
+        # URLs arrive already claimed in self.visited (by their canonical key)
+        if self.pages >= MAX_PAGES:
             return []
-        self.visited.add(url)
         self.pages += 1
         print(f"[{self.pages:4d}] 🕵️ {url[:60]}...")
 
-        html = await self.fetch_with_evasion(url)
+        # Paced by the worker: one slot per page, shared by the fast fetch and any browser fallback
+        html = await self.fetch_fast(url) or await self.fetch_with_evasion(url)
         if not html:
             return []
 
         # Extract emails + AI classification
         new_emails = self.extract_and_clean_emails(html)
+        page_ctx = None
         for email in new_emails:
             if email not in self.profiles:
-                ai_data = self.classify_profile(html, email)
+                if page_ctx is None:
+                    # Only decode raw bodies once the classifier actually needs text
+                    text = html.decode('utf-8', 'ignore') if isinstance(html, bytes) else html
+                    page_ctx = self._analyze_page(text)
+                ai_data = self._classify_email(page_ctx, email)
                 self.profiles[email] = {
                     "email": email,
                     "name": ai_data["name"],
@@ -277,32 +558,40 @@ class KingHarvester:
                 # Create individual dossier
                 self._write_dossier(email, self.profiles[email])
 
+        # Partition hrefs once: documents to mine, everything else to follow
+        doc_links, links = [], []
+        for href in self._extract_hrefs(html):
+            if Path(urlparse(href).path).suffix.lower() in DOCUMENT_EXTENSIONS:
+                doc_links.append(href)
+            else:
+                links.append(href)
+
         # Mine documents
-        doc_links = re.findall(r'href=[\'"]?([^\'" >]+\.(pdf|docx?|pptx?))', html, re.IGNORECASE)
-        for link, _ in doc_links:
+        for link in doc_links:
             full_url = urljoin(url, link)
             if full_url not in self.documents:
                 self.documents.add(full_url)
                 doc_path = await self.download_document(full_url)
                 if doc_path:
-                    doc_emails = self.extract_emails_from_doc(doc_path)
+                    # Parsing is CPU-bound; keep it off the event loop
+                    doc_emails = await asyncio.get_running_loop().run_in_executor(
+                        self._doc_pool, _extract_emails_sync, doc_path, self.base_domain)
                     for email in doc_emails:
-                        if email not in self.profiles:
-                            self.profiles[email] = {
-                                "email": email,
-                                "name": "",
-                                "seniority": "unknown",
-                                "department": "General",
-                                "confidence": 0.4,
-                                "source_url": full_url,
-                                "context_snippet": "From document"
-                            }
-                            self._write_dossier(email, self.profiles[email])
+                        profile = {
+                            "email": email,
+                            "name": "",
+                            "seniority": "unknown",
+                            "department": "General",
+                            "confidence": 0.4,
+                            "source_url": full_url,
+                            "context_snippet": "From document"
+                        }
+                        if self.profiles.setdefault(email, profile) is profile:
+                            self._write_dossier(email, profile)
 
         # Next links
         next_urls = []
         if self.pages < MAX_PAGES:
-            links = re.findall(r'href=[\'"]?([^\'" >]+)', html)
             for raw in links:
                 if raw.startswith(('http://', 'https://')):
                     full = raw
@@ -311,66 +600,72 @@ class KingHarvester:
                 else:
                     continue
                 parsed = urlparse(full)
+                if Path(parsed.path).suffix.lower() in SKIP_EXTENSIONS:
+                    continue
                 domain = parsed.netloc.lower()
                 if domain == self.base_domain or domain.endswith('.' + self.base_domain):
-                    if full not in self.visited:
+                    if self._claim(full):
                         next_urls.append(full)
         return next_urls
 
     def _write_dossier(self, email: str, data: Dict):
-        """Write human-readable dossier file"""
+        """Queue human-readable dossier file (flushed in finalize)"""
         safe_email = email.replace('@', '_at_').replace('.', '_')
         dossier_path = self.out_dir / f"dossier_{safe_email}.txt"
-        with open(dossier_path, 'w', encoding='utf-8') as f:
-            f.write(f"📧 EMAIL INTELLIGENCE DOSSIER\n")
-            f.write(f"{'='*50}\n")
-            f.write(f"Target Email     : {data['email']}\n")
-            f.write(f"Name             : {data['name'] or 'Not identified'}\n")
-            f.write(f"Seniority Level  : {data['seniority'].title()}\n")
-            f.write(f"Department       : {data['department']}\n")
-            f.write(f"Confidence Score : {data['confidence']:.0%}\n")
-            f.write(f"Source URL       : {data['source_url']}\n")
-            f.write(f"Context Snippet  : {data['context_snippet']}\n")
-            f.write(f"\n[AI Analysis]\n")
-            if data['confidence'] >= 0.8:
-                f.write("✅ HIGH CONFIDENCE: Likely accurate profile\n")
-            elif data['confidence'] >= 0.6:
-                f.write("⚠️  MEDIUM CONFIDENCE: Verify manually\n")
-            else:
-                f.write("❌ LOW CONFIDENCE: Treat as unverified\n")
+        lines = [
+            f"📧 EMAIL INTELLIGENCE DOSSIER\n",
+            f"{'='*50}\n",
+            f"Target Email     : {data['email']}\n",
+            f"Name             : {data['name'] or 'Not identified'}\n",
+            f"Seniority Level  : {data['seniority'].title()}\n",
+            f"Department       : {data['department']}\n",
+            f"Confidence Score : {data['confidence']:.0%}\n",
+            f"Source URL       : {data['source_url']}\n",
+            f"Context Snippet  : {data['context_snippet']}\n",
+            f"\n[AI Analysis]\n"
+        ]
+        if data['confidence'] >= 0.8:
+            lines.append("✅ HIGH CONFIDENCE: Likely accurate profile\n")
+        elif data['confidence'] >= 0.6:
+            lines.append("⚠️  MEDIUM CONFIDENCE: Verify manually\n")
+        else:
+            lines.append("❌ LOW CONFIDENCE: Treat as unverified\n")
+        self._pending_dossiers.append((dossier_path, "".join(lines)))
+
+    def _flush_dossiers(self):
+        """Write every queued dossier in one batch, off the crawl's hot path"""
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(_write_one, self._pending_dossiers))
+        self._pending_dossiers.clear()
 
     # ==================== EXCEL MASTER OUTPUT ====================
     def export_to_excel(self):
-        """Create professional Excel report"""
+        """Create professional Excel report (streamed, constant memory)"""
         try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from openpyxl.utils import get_column_letter
+            import xlsxwriter
         except ImportError:
-            print("⚠️  openpyxl not installed. Installing...")
-            os.system('pip install openpyxl')
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from openpyxl.utils import get_column_letter
+            print("⚠️  xlsxwriter not installed. Installing...")
+            os.system('pip install xlsxwriter')
+            import xlsxwriter
+
+        excel_path = self.out_dir / f"EMAIL_INTELLIGENCE_{self.base_domain.upper()}.xlsx"
+        wb = xlsxwriter.Workbook(str(excel_path), {'constant_memory': True})
+        ws = wb.add_worksheet("Email Intelligence")
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Email Intelligence"
+        # Styling (formats are created once and shared by every row)
+        header_fmt = wb.add_format({'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092',
+                                    'align': 'center'})
+        high_fmt = wb.add_format({'bg_color': '#C6EFCE'})    # Green
+        medium_fmt = wb.add_format({'bg_color': '#FFEB9C'})  # Yellow
+        low_fmt = wb.add_format({'bg_color': '#FFC7CE'})     # Red
 
         # Header
         headers = ["Email", "Name", "Seniority", "Department", "Confidence", "Source URL", "Context Snippet"]
-        ws.append(headers)
-        
-        # Styling
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        for col in range(1, len(headers)+1):
-            ws.cell(1, col).font = header_font
-            ws.cell(1, col).fill = header_fill
-            ws.cell(1, col).alignment = Alignment(horizontal="center")
+        ws.write_row(0, 0, headers, header_fmt)
+        col_widths = [len(h) for h in headers]
 
         # Data rows
-        for email, data in self.profiles.items():
+        for row_idx, data in enumerate(self.profiles.values(), start=1):
             row = [
                 data['email'],
                 data['name'],
@@ -380,42 +675,45 @@ class KingHarvester:
                 data['source_url'],
                 data['context_snippet'][:100] + "..." if len(data['context_snippet']) > 100 else data['context_snippet']
             ]
-            ws.append(row)
             
             # Color-code by confidence
             confidence = data['confidence']
             if confidence >= 0.8:
-                fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")  # Green
+                fmt = high_fmt
             elif confidence >= 0.6:
-                fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")  # Yellow
+                fmt = medium_fmt
             else:
-                fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")  # Red
+                fmt = low_fmt
+            ws.write_row(row_idx, 0, row, fmt)
             
-            for col in range(1, len(headers)+1):
-                ws.cell(ws.max_row, col).fill = fill
-
-        # Auto-adjust column widths
-        for col in ws.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column].width = adjusted_width
+            for i, value in enumerate(row):
+                col_widths[i] = max(col_widths[i], len(str(value)))
 
-        excel_path = self.out_dir / f"EMAIL_INTELLIGENCE_{self.base_domain.upper()}.xlsx"
-        wb.save(excel_path)
+        # Column widths from the running maxima
+        for i, width in enumerate(col_widths):
+            ws.set_column(i, i, min(width + 2, 50))
+
+        wb.close()
         return excel_path
 
     # ==================== MAIN CRAWL LOOP ====================
     async def init_session(self):
+        # One pooled connector shared by crt.sh, document and page fetches
+        connector = aiohttp.TCPConnector(
+            limit=CONCURRENT * 4,
+            limit_per_host=CONCURRENT,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+            enable_cleanup_closed=True
+        )
         self.session = aiohttp.ClientSession(
+            connector=connector,
             timeout=aiohttp.ClientTimeout(total=TIMEOUT),
-            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+            cookie_jar=aiohttp.DummyCookieJar(),  # recon traffic needs no cookie bookkeeping
+            read_bufsize=4 * 1024 * 1024,
+            raise_for_status=False,
+            trust_env=True
         )
 
     async def crawl(self):
@@ -429,33 +727,60 @@ class KingHarvester:
         for path in sensitive_paths:
             start_urls.append(urljoin(self.root_url, path))
         
-        queue = deque(start_urls)
-        tasks = set()
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in start_urls:
+            if self._claim(url):
+                queue.put_nowait((url, False))
         
-        while (queue or tasks) and self.pages < MAX_PAGES:
-            while queue and len(tasks) < CONCURRENT:
-                url = queue.popleft()
-                task = asyncio.create_task(self._worker(url, queue))
-                tasks.add(task)
-                task.add_done_callback(tasks.discard)
-            await asyncio.sleep(0.01)
+        # Fixed pool of long-lived workers; join() returns once nothing is queued or in flight
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(CONCURRENT)]
+        await queue.join()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
         
         print(f"\n👑 KING RECON COMPLETE: {len(self.profiles)} profiles from {self.pages} assets")
 
-    async def _worker(self, url: str, queue: deque):
-        next_urls = await self.scrape_page(url)
-        for u in next_urls:
-            queue.append(u)
-        await asyncio.sleep(random.uniform(*DELAY))
+    async def _worker(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            url, paced = await queue.get()
+            if not paced and self.pages < MAX_PAGES:
+                wait = self._pace(url)
+                if wait > 0:
+                    # Not this host's turn yet: park the URL on a timer, not the worker,
+                    # so URLs for other hosts keep flowing
+                    self._parked[url] = loop.call_later(wait, self._requeue, queue, url)
+                    continue
+            try:
+                for u in await self.scrape_page(url):
+                    queue.put_nowait((u, False))
+                if self._parked and self.pages >= MAX_PAGES:
+                    # Budget spent: release parked URLs now instead of waiting out their slots
+                    for parked in list(self._parked):
+                        self._parked.pop(parked).cancel()
+                        self._requeue(queue, parked)
+            except Exception as e:
+                print(f"⚠️  Worker error on {url[:60]}: {str(e)[:60]}")
+            finally:
+                queue.task_done()
+
+    def _requeue(self, queue: asyncio.Queue, url: str):
+        """Put a paced URL back once its slot opens; task_done settles the get() that parked it"""
+        self._parked.pop(url, None)
+        queue.put_nowait((url, True))
+        queue.task_done()
 
     async def close(self):
         if self.session:
             await self.session.close()
         if self.browser:
             await self.browser.close()
+        self._doc_pool.shutdown(wait=False, cancel_futures=True)
 
     def finalize(self):
         """Generate final reports"""
+        self._flush_dossiers()
         excel_path = self.export_to_excel()
         summary_path = self.out_dir / "RECON_SUMMARY.txt"
         
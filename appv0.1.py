@@ -5,11 +5,38 @@ import csv
 import time
 import random
 import aiohttp
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 from playwright.async_api import async_playwright
-from collections import deque
 import logging
-from typing import Set, List
+import os
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Set, Dict, List, Tuple, FrozenSet
+
+try:
+    import re2 as re_engine  # pip install google-re2 (linear-time DFA for page scans)
+except ImportError:
+    re_engine = re
+
+try:
+    import xxhash  # pip install xxhash (64-bit URL fingerprints)
+except ImportError:
+    xxhash = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser  # pip install selectolax (C-backed link extraction)
+except ImportError:
+    HTMLParser = None
+
+try:
+    import orjson  # pip install orjson (fast crt.sh parsing + exports)
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # pip install uvloop (libuv-backed event loop)
+except ImportError:
+    uvloop = None
 
 # Disable noisy logs
 logging.getLogger("asyncio").setLevel(logging.WARNING)
@@ -21,11 +48,35 @@ MAX_SUBDOMAINS = 10
 CONCURRENT = 15
 DELAY = (0.8, 2.2)
 TIMEOUT = 12
-USER_AGENTS = [
+CONTEXT_RECYCLE_PAGES = 50  # close + recreate a pooled browser context after this many pages
+BLOCKED_RESOURCES = {"image", "font", "media"}  # never downloaded by the browser
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref'}  # dropped (with utm_*) when canonicalizing URLs
+STATIC_MIN_LINKS = 3  # static HTML with emails or more same-domain links than this skips Playwright
+JS_REQUIRED_AFTER = 2  # consecutive static misses the browser made up for before a host goes straight to Playwright
+HTML_TYPES = {'text/html', 'application/xhtml+xml'}  # other 200 replies are skipped, never rendered
+SKIP_SUFFIXES = ('.jpg', '.jpeg', '.png', '.gif', '.svg', '.ico', '.webp', '.css', '.js',
+                 '.woff', '.woff2', '.ttf', '.eot', '.mp3', '.mp4', '.zip')  # never enqueued
+# CDP endpoint of an already-running Chromium (e.g. one started with
+# --remote-debugging-port=9222) to share across harvesters instead of launching one each
+SHARED_CDP = os.environ.get("NEXUS_SHARED_CDP")
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
-]
+)
+LAUNCH_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--no-sandbox",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--blink-settings=imagesEnabled=false"
+)
+INIT_SCRIPT = """
+    delete navigator.__proto__.webdriver;
+    window.chrome = {runtime: {}};
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+"""
 
 # Common subdomains for universities
 COMMON_SUBDOMAINS = [
@@ -33,75 +84,170 @@ COMMON_SUBDOMAINS = [
     "admissions", "students", "library", "research", "alumni", "contact"
 ]
 
+# Precompiled patterns (run against every fetched page). Page-level scans go through
+# re_engine, so they stay RE2-compatible: inline (?i) flags, no lookarounds/backrefs.
+# Pages are scanned as raw bytes; only matched emails and links are decoded.
+DOT_SEP = r'(?:\s*[\[\(]dot[\]\)]\s*|\s+dot\s+)'  # "[dot]", "(dot)" or " dot "
+# Local part and labels are length-capped to bound the work per candidate
+# Only target-domain emails are kept, so the domain is baked into the email
+# pattern with TARGET_EMAIL_TEMPLATE.format(domain=re.escape(base_domain)).
+# Group 1 is the address; group 2 catches look-alikes (duet.edu.pk.evil.com,
+# duet.edu.pk-x) that a lookahead would otherwise have to reject.
+TARGET_EMAIL_TEMPLATE = r'\b([A-Za-z0-9._%+-]{{1,64}}@(?:[A-Za-z0-9-]{{1,63}}\.){{0,8}}{domain})\b(\.[A-Za-z0-9]|-)?'
+# Every email form, dispatched on the matched branch:
+#   std    - john@duet.edu.pk (TARGET_EMAIL_TEMPLATE)
+#   obf    - john [at] duet [dot] edu [dot] pk  /  john(at)duet.edu.pk
+#   nameat - john at duet dot edu dot pk
+EMAIL_BRANCHES = (
+    ("std", '(?P<std>' + TARGET_EMAIL_TEMPLATE + ')'),
+    ("obf", r'(?P<obf>(?P<obf_local>[A-Za-z0-9._%+-]+)\s*[\[\(]at[\]\)]\s*'
+            rf'(?P<obf_domain>[A-Za-z0-9-]+(?:(?:{DOT_SEP}|\.)[A-Za-z0-9-]+)+))'),
+    ("nameat", r'(?P<nameat>(?P<na_local>[A-Za-z0-9._-]+)\s+at\s+'
+               rf'(?P<na_domain>[A-Za-z0-9.-]+(?:{DOT_SEP}[A-Za-z0-9-]+)+))')
+)
+# std runs over the whole page whenever it contains an "@". The obfuscated forms
+# only run inside +-TOKEN_WINDOW bytes around hits of their literal tokens.
+TOKEN_WINDOW = 100
+WINDOW_TOKENS = (
+    (b"[at]", "obf"), (b"(at)", "obf"), (b"[AT]", "obf"), (b"(AT)", "obf"), (b"[At]", "obf"), (b"(At)", "obf"),
+    (b"dot", "nameat"), (b"DOT", "nameat"), (b"Dot", "nameat")
+)
+DOT_SEP_RE = re.compile(DOT_SEP.encode(), re.IGNORECASE)
+HREF_RE = re_engine.compile(rb'''href=['"]?([^'" >]+)''')
+
 # =============== EMAIL INTELLIGENCE ===============
-def extract_and_clean_emails(text: str, base_domain: str) -> Set[str]:
+def _token_windows(data: bytes) -> Tuple[FrozenSet[str], List[List[int]]]:
+    """Obfuscated forms whose tokens occur in data, and the merged byte ranges around the hits"""
+    kinds, spans = set(), []
+    for token, kind in WINDOW_TOKENS:
+        pos = data.find(token)
+        while pos != -1:
+            kinds.add(kind)
+            spans.append((max(0, pos - TOKEN_WINDOW), pos + len(token) + TOKEN_WINDOW))
+            pos = data.find(token, pos + 1)
+    spans.sort()
+    windows = []
+    for start, end in spans:
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return frozenset(kinds), windows
+
+@lru_cache(maxsize=None)
+def _email_scanner(kinds: FrozenSet[str], base_domain: str):
+    """Combined bytes scan restricted to the given branches, plus group index -> kind"""
+    pattern = '(?i)' + '|'.join(branch for kind, branch in EMAIL_BRANCHES if kind in kinds)
+    scanner = re_engine.compile(pattern.format(domain=re.escape(base_domain)).encode())
+    # RE2 reports bytes group names for bytes patterns, re reports str
+    by_index = {index: name.decode() if isinstance(name, bytes) else name
+                for name, index in scanner.groupindex.items()}
+    return scanner, by_index
+
+def _collect_emails(kinds: FrozenSet[str], data: bytes, base_domain: str, emails: Set[str]):
+    """Add every target-domain email the given branches match in data"""
+    scanner, by_index = _email_scanner(kinds, base_domain)
+    # Obfuscated forms are rebuilt from their own match only.
+    # m.lastindex is the branch's outer group; the next two are
+    # address/tail for std and local/domain for the obfuscated forms.
+    for m in scanner.finditer(data):
+        i = m.lastindex
+        if by_index[i] == "std":
+            if m.group(i + 2):
+                continue
+            email = m.group(i + 1).decode('ascii').lower()
+        else:
+            raw = m.group(i + 1) + b"@" + DOT_SEP_RE.sub(b".", m.group(i + 2))
+            email = raw.decode('ascii').lower()
+            if not is_target_domain(email, base_domain):
+                continue
+        if _valid_local_part(email):
+            emails.add(email)
+
+def extract_and_clean_emails(data: bytes, base_domain: str) -> Set[str]:
     """Advanced email extraction with de-obfuscation"""
     emails = set()
     base_domain = base_domain.lower()
-    
-    # 1. Standard emails
-    std_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-    for email in std_emails:
-        if is_target_domain(email, base_domain):
-            emails.add(email.lower())
-    
-    # 2. De-obfuscate: "john [at] duet [dot] edu [dot] pk"
-    if "[at]" in text or "(at)" in text:
-        # Normalize
-        clean = re.sub(r'[\[\(]at[\]\)]', '@', text, flags=re.IGNORECASE)
-        clean = re.sub(r'[\[\(]dot[\]\)]', '.', clean, flags=re.IGNORECASE)
-        clean = re.sub(r'\s+dot\s+', '.', clean, flags=re.IGNORECASE)
-        clean = re.sub(r'\s+at\s+', '@', clean, flags=re.IGNORECASE)
-        # Now extract
-        deob_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', clean)
-        for email in deob_emails:
-            if is_target_domain(email, base_domain):
-                emails.add(email.lower())
-    
-    # 3. Handle "name at domain dot pk" patterns
-    patterns = [
-        r'([a-z0-9._-]+)\s+at\s+([a-z0-9.-]+)\s+dot\s+([a-z]{2,})',
-        r'([a-z0-9._-]+) at ([a-z0-9.-]+) dot ([a-z]{2,})'
-    ]
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for local, domain_part, tld in matches:
-            email = f"{local}@{domain_part}.{tld}"
-            if is_target_domain(email, base_domain):
-                emails.add(email.lower())
+    if b"@" in data:
+        _collect_emails(frozenset({"std"}), data, base_domain, emails)
+    kinds, windows = _token_windows(data)
+    for start, end in windows:
+        _collect_emails(kinds, data[start:end], base_domain, emails)
     
     return emails
 
 def is_target_domain(email: str, base_domain: str) -> bool:
-    """Check if email belongs to base domain or its subdomains"""
-    if '@' not in email:
+    """Check if email belongs to base domain or its subdomains (both already lowercase)"""
+    at = email.rfind('@')
+    if at < 0:
         return False
-    _, domain = email.lower().rsplit('@', 1)
-    base_domain = base_domain.lower()
-    return domain == base_domain or domain.endswith('.' + base_domain)
+    domain = email[at + 1:]
+    return domain == base_domain or (domain.endswith(base_domain) and domain[-len(base_domain) - 1] == '.')
+
+def _write_json(path: str, obj) -> None:
+    """Indented JSON export, through orjson when available"""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+def url_fingerprint(url: str) -> int:
+    """64-bit fingerprint kept in visited/document sets instead of the full URL"""
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(url.encode())
+    return int.from_bytes(blake2b(url.encode(), digest_size=8).digest(), 'big')
+
+def _valid_local_part(email: str) -> bool:
+    """Reject RFC-illegal dots in the local part (leading, trailing or doubled)"""
+    local = email.split('@', 1)[0]
+    return not (local.startswith('.') or local.endswith('.') or '..' in local)
+
+def _extract_hrefs(html) -> List[str]:
+    """All <a href> values in one DOM parse, regex fallback without selectolax"""
+    if HTMLParser is not None:
+        hrefs = (node.attributes.get('href') for node in HTMLParser(html).css('a[href]'))
+        return [href.strip() for href in hrefs if href]
+    return [m.decode('utf-8', 'ignore') for m in HREF_RE.findall(html)]
 
 # =============== STEALTHY FETCHER ===============
+async def _block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 class EliteHarvester:
     def __init__(self, root_url: str):
         self.root_url = root_url.rstrip('/')
         self.base_domain = urlparse(root_url).netloc.lower()
         if self.base_domain.startswith('www.'):
             self.base_domain = self.base_domain[4:]
+        self._dot_base = '.' + self.base_domain
             
         self.emails: Set[str] = set()
-        self.visited: Set[str] = set()
+        self.visited: Set[int] = set()  # url_fingerprint() of each claimed canonical URL
         self.session = None
         self.browser = None
         self.pages = 0
+        self.context_pool: asyncio.Queue = asyncio.Queue()  # (context, pages served)
+        self._browser_lock = asyncio.Lock()
+        self._static_misses: Dict[str, int] = {}  # host -> consecutive static misses the browser filled
+        self._js_required_hosts: Set[str] = set()
 
     async def init_session(self):
-        connector = aiohttp.TCPConnector(limit=CONCURRENT, ssl=False)
-        timeout = aiohttp.ClientTimeout(total=TIMEOUT)
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers={"User-Agent": random.choice(USER_AGENTS)}
+        # One pooled session for the whole crawl; UA rotates per request, not per session
+        connector = aiohttp.TCPConnector(
+            limit=CONCURRENT * 2,
+            limit_per_host=CONCURRENT,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=30,
+            ssl=False
         )
+        timeout = aiohttp.ClientTimeout(total=TIMEOUT, connect=3, sock_read=TIMEOUT)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
 
     async def close(self):
         if self.session:
@@ -109,96 +255,176 @@ class EliteHarvester:
         if self.browser:
             await self.browser.close()
 
-    async def fetch_static(self, url: str) -> str:
-        """Fast static fetch with retries"""
+    async def fetch_static(self, url: str) -> Tuple[bytes, str]:
+        """Fast static fetch with retries: (raw body, content type), ("", "") unless a 200 came back"""
         for attempt in range(3):
             try:
-                async with self.session.get(url) as resp:
+                async with self.session.get(url, headers={"User-Agent": random.choice(USER_AGENTS)}) as resp:
                     if resp.status == 200:
-                        return await resp.text()
+                        # A reply without Content-Type is given the benefit of the doubt
+                        ctype = resp.content_type if 'Content-Type' in resp.headers else 'text/html'
+                        if ctype not in HTML_TYPES:
+                            return b"", ctype
+                        return await resp.read(), ctype
                     elif resp.status == 403 or resp.status == 429:
                         await asyncio.sleep(5)
             except Exception as e:
                 if attempt == 2:
                     print(f"❌ Static fetch failed for {url}: {str(e)[:50]}")
                 await asyncio.sleep(2)
-        return ""
+        return b"", ""
 
-    async def fetch_dynamic(self, url: str) -> str:
-        """Stealthy Playwright fetch with evasion"""
-        if not self.browser:
-            pw = await async_playwright().start()
-            self.browser = await pw.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-web-security",
-                    "--no-sandbox",
-                    "--disable-features=IsolateOrigins,site-per-process"
-                ]
-            )
-        
+    async def init_browser(self):
+        """Launch Chromium and pre-warm one context per concurrent worker"""
+        pw = await async_playwright().start()
+        if SHARED_CDP:
+            self.browser = await pw.chromium.connect_over_cdp(SHARED_CDP)
+        else:
+            self.browser = await pw.chromium.launch(headless=True, args=list(LAUNCH_ARGS))
+        # Always CONCURRENT slots; a slot whose context failed to open stays
+        # empty (None) and is rebuilt by the next fetch that takes it
+        for _ in range(CONCURRENT):
+            try:
+                context = await self._new_context()
+            except Exception as e:
+                print(f"⚠️  Browser context failed to open: {str(e)[:60]}")
+                context = None
+            self.context_pool.put_nowait((context, 0))
+
+    async def _new_context(self):
         context = await self.browser.new_context(
             user_agent=random.choice(USER_AGENTS),
             viewport={"width": 1920, "height": 1080},
             java_script_enabled=True,
             bypass_csp=True
         )
-        await context.add_init_script("""
-            delete navigator.__proto__.webdriver;
-            window.chrome = {runtime: {}};
-            Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-            Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-        """)
+        await context.add_init_script(INIT_SCRIPT)
+        await context.route("**/*", _block_heavy_resources)
+        return context
+
+    async def _release_context(self, context, uses: int):
+        """Return a slot to the pool, closing its context every CONTEXT_RECYCLE_PAGES pages"""
+        # Only a context that is still open goes back; closed or broken ones
+        # leave the slot empty so the next fetch opens a fresh context
+        if context is not None:
+            try:
+                if uses >= CONTEXT_RECYCLE_PAGES:
+                    await context.close()
+                    context = None
+                else:
+                    await context.clear_cookies()
+            except Exception:
+                context = None
+        self.context_pool.put_nowait((context, uses if context is not None else 0))
+
+    async def fetch_dynamic(self, url: str) -> str:
+        """Stealthy Playwright fetch with evasion"""
+        async with self._browser_lock:
+            if not self.browser:
+                await self.init_browser()
         
-        page = await context.new_page()
+        context, uses = await self.context_pool.get()
         try:
-            await page.goto(url, wait_until="networkidle", timeout=TIMEOUT*1000)
-            await page.wait_for_timeout(2000)
-            content = await page.content()
-            return content
+            if context is None:
+                context = await self._new_context()
+            page = await context.new_page()
+            try:
+                await page.goto(url, wait_until="networkidle", timeout=TIMEOUT*1000)
+                await page.wait_for_timeout(2000)
+                content = await page.content()
+                return content
+            finally:
+                await page.close()
         except Exception as e:
             print(f"⚠️  Dynamic fetch failed: {str(e)[:60]}")
             return ""
         finally:
-            await context.close()
+            await self._release_context(context, uses + 1)
 
     async def scrape_page(self, url: str):
-        """Scrape with fallback: static → dynamic"""
-        if url in self.visited or self.pages >= MAX_PAGES:
+        """Scrape with fallback: static → dynamic (url is already claimed)"""
+        if self.pages >= MAX_PAGES:
             return
-        self.visited.add(url)
         self.pages += 1
         print(f"[{self.pages}] 🔍 {url}")
 
-        # Try fast static first
-        html = await self.fetch_static(url)
-        if not html or "<noscript>" in html or "enable JavaScript" in html.lower():
-            html = await self.fetch_dynamic(url)
-        
-        if not html:
-            return
+        # Try fast static first; only fall back to a browser when the static
+        # HTML carries no evidence (emails or links) of real content
+        host = urlparse(url).netloc.lower()
+        new_emails, links = set(), []
+        static_html = False  # a 200 HTML reply came back statically
+        if host not in self._js_required_hosts:
+            html, ctype = await self.fetch_static(url)
+            if ctype and ctype not in HTML_TYPES:
+                return  # images, PDFs, archives: nothing to scrape, nothing a browser would add
+            static_html = bool(ctype)
+            if html:
+                new_emails = extract_and_clean_emails(html, self.base_domain)
+                links = self._same_domain_links(url, html)
+            if new_emails or len(links) > STATIC_MIN_LINKS:
+                self._static_misses.pop(host, None)
+        if not new_emails and len(links) <= STATIC_MIN_LINKS:
+            html = (await self.fetch_dynamic(url)).encode('utf-8')
+            if html:
+                dyn_emails = extract_and_clean_emails(html, self.base_domain)
+                dyn_links = self._same_domain_links(url, html)
+                # Only a real static HTML page that the browser improved on counts
+                # against the host; errors and dead links never do
+                if static_html:
+                    if dyn_emails - new_emails or len(dyn_links) > len(links):
+                        misses = self._static_misses.get(host, 0) + 1
+                        self._static_misses[host] = misses
+                        if misses >= JS_REQUIRED_AFTER:
+                            self._js_required_hosts.add(host)
+                    else:
+                        self._static_misses.pop(host, None)
+                new_emails |= dyn_emails
+                if len(dyn_links) > len(links):
+                    links = dyn_links
 
-        # Extract emails
-        new_emails = extract_and_clean_emails(html, self.base_domain)
         self.emails.update(new_emails)
 
-        # Extract links (same domain only)
-        if self.pages < MAX_PAGES:
-            urls = re.findall(r'href=[\'"]?([^\'" >]+)', html)
-            for raw_link in urls:
-                if raw_link.startswith(('http://', 'https://')):
-                    full_url = raw_link
-                elif raw_link.startswith('/'):
-                    full_url = urljoin(url, raw_link)
-                else:
-                    continue
-                
-                parsed = urlparse(full_url)
-                domain = parsed.netloc.lower()
-                if domain == self.base_domain or domain.endswith('.' + self.base_domain):
-                    if full_url not in self.visited:
-                        yield full_url
+        # Claim at enqueue so duplicates never reach the queue; stop once
+        # MAX_PAGES URLs have been claimed
+        for full_url in links:
+            if len(self.visited) >= MAX_PAGES:
+                break
+            if self._claim(full_url):
+                yield full_url
+
+    def _canon(self, url: str) -> str:
+        """Dedup key only: lowercase host, no fragment/tracking keys/trailing slash.
+        Pages are still fetched and joined against the URL as linked."""
+        parts = urlsplit(url)
+        query = '&'.join(p for p in parts.query.split('&')
+                         if p.partition('=')[0] not in TRACKING_PARAMS and not p.startswith('utm_'))
+        path = parts.path.rstrip('/') or '/'
+        return urlunsplit((parts.scheme, parts.netloc.lower(), path, query, ''))
+
+    def _claim(self, url: str) -> bool:
+        """Mark a URL's canonical key as visited; False if it already was (one set op, no await)"""
+        before = len(self.visited)
+        self.visited.add(url_fingerprint(self._canon(url)))
+        return len(self.visited) != before
+
+    def _same_domain_links(self, url: str, html: bytes) -> List[str]:
+        """Absolute same-domain links found in a page"""
+        links = []
+        for raw_link in _extract_hrefs(html):
+            if raw_link.startswith(('http://', 'https://')):
+                full_url = raw_link
+            elif raw_link.startswith('/'):
+                full_url = urljoin(url, raw_link)
+            else:
+                continue
+            
+            parsed = urlparse(full_url)
+            if parsed.path.lower().endswith(SKIP_SUFFIXES):
+                continue
+            domain = parsed.netloc.lower()
+            if domain == self.base_domain or domain.endswith(self._dot_base):
+                links.append(full_url)
+        return links
 
     async def crawl(self):
         """Multi-layer crawl with subdomains"""
@@ -209,26 +435,31 @@ class EliteHarvester:
         for sub in COMMON_SUBDOMAINS[:MAX_SUBDOMAINS]:
             urls_to_crawl.append(f"https://{sub}.{self.base_domain}")
         
-        queue = deque(urls_to_crawl)
-        tasks = set()
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in urls_to_crawl:
+            if self._claim(url):
+                queue.put_nowait(url)
         
-        while (queue or tasks) and self.pages < MAX_PAGES:
-            # Add new URLs to queue
-            while queue and len(tasks) < CONCURRENT:
-                url = queue.popleft()
-                task = asyncio.create_task(self._process_url(url, queue))
-                tasks.add(task)
-                task.add_done_callback(tasks.discard)
-            
-            if tasks:
-                await asyncio.sleep(0.1)  # Prevent busy wait
+        # Fixed pool of long-lived workers; join() returns once nothing is queued or in flight
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(CONCURRENT)]
+        await queue.join()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
         
         print(f"\n✅ Crawled {self.pages} pages. Found {len(self.emails)} emails.")
 
-    async def _process_url(self, url: str, queue: deque):
-        async for new_url in self.scrape_page(url):
-            queue.append(new_url)
-        await asyncio.sleep(random.uniform(*DELAY))
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            url = await queue.get()
+            try:
+                async for new_url in self.scrape_page(url):
+                    queue.put_nowait(new_url)
+                await asyncio.sleep(random.uniform(*DELAY))
+            except Exception as e:
+                print(f"⚠️  Worker error on {url[:60]}: {str(e)[:60]}")
+            finally:
+                queue.task_done()
 
     def export(self):
         clean_name = self.base_domain.replace(".", "_")
@@ -240,8 +471,7 @@ class EliteHarvester:
             "total": len(self.emails),
             "emails": [{"value": e, "type": "personal", "confidence": "high"} for e in sorted(self.emails)]
         }
-        with open(f"emails_{clean_name}_{timestamp}.json", "w") as f:
-            json.dump(result, f, indent=2)
+        _write_json(f"emails_{clean_name}_{timestamp}.json", result)
         
         # CSV
         with open(f"emails_{clean_name}_{timestamp}.csv", "w", newline="") as f:
@@ -268,4 +498,7 @@ async def main():
         await harvester.close()
 
 if __name__ == "__main__":
+    # The policy has to be in place before asyncio.run() creates the loop
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
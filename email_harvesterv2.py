@@ -6,14 +6,40 @@ import time
 import random
 import aiohttp
 import base64
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 from playwright.async_api import async_playwright
-from collections import deque
 from pathlib import Path
 import logging
-from typing import Set, Dict, List, Tuple
-import subprocess
+from typing import Set, Dict, List, Tuple, Optional
 import os
+import io
+import zipfile
+from hashlib import blake2b
+
+try:
+    import re2 as re_engine  # pip install google-re2 (linear-time DFA for page scans)
+except ImportError:
+    re_engine = re
+
+try:
+    import xxhash  # pip install xxhash (64-bit URL fingerprints)
+except ImportError:
+    xxhash = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser  # pip install selectolax (C-backed link extraction)
+except ImportError:
+    HTMLParser = None
+
+try:
+    import orjson  # pip install orjson (fast crt.sh parsing + exports)
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # pip install uvloop (libuv-backed event loop)
+except ImportError:
+    uvloop = None
 
 # =============== CONFIG (Tactical Settings) ===============
 MAX_PAGES = 800
@@ -22,6 +48,38 @@ CONCURRENT = 20
 DELAY = (0.5, 1.8)
 TIMEOUT = 10
 AI_CONFIDENCE_THRESHOLD = 0.7  # For role prediction
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref'}  # dropped (with utm_*) when canonicalizing URLs
+CONTEXT_RECYCLE_PAGES = 50  # close + recreate a pooled browser context after this many pages
+BLOCKED_RESOURCES = {"image", "font", "media"}  # never downloaded by the browser
+# CDP endpoint of an already-running Chromium (e.g. one started with
+# --remote-debugging-port=9222) to share across harvesters instead of launching one each
+SHARED_CDP = os.environ.get("NEXUS_SHARED_CDP")
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+)
+BROWSER_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15"
+)
+LAUNCH_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--no-sandbox",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--disable-extensions",
+    "--disable-plugins",
+    "--disable-images",  # Faster
+    "--blink-settings=imagesEnabled=false"
+)
+# Critical evasion scripts
+INIT_SCRIPT = """
+    delete navigator.__proto__.webdriver;
+    window.chrome = { runtime: {} };
+    Object.defineProperty(navigator, 'permissions', { get: () => ({ query: Promise.resolve({ state: 'granted' }) }) });
+    Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+    Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
+"""
 
 # Common sensitive paths (for deep discovery)
 SENSITIVE_PATHS = [
@@ -31,6 +89,67 @@ SENSITIVE_PATHS = [
 
 # File extensions to download & parse
 DOCUMENT_EXTENSIONS = {'.pdf', '.doc', '.docx', '.ppt', '.pptx'}
+DOC_SUFFIXES = tuple(DOCUMENT_EXTENSIONS)
+DOC_CHUNK = 64 * 1024  # streaming read size for document downloads
+MAX_DOC_BYTES = 50 * 1024 * 1024  # documents are buffered in memory, so larger ones are skipped
+DOC_CONCURRENT = 8  # in-flight document downloads, kept below the per-host connection limit
+# Documents get their own timeout: no connect budget (that would also count time
+# spent waiting for a pooled connection), a longer total for large files
+DOC_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_connect=TIMEOUT, sock_read=TIMEOUT)
+OOXML_TEXT_PARTS = {'.docx': 'word/document.xml', '.pptx': 'ppt/slides/slide'}  # zip members holding the text
+
+# Precompiled patterns. Full-page scans go through re_engine, so they stay
+# RE2-compatible (inline (?i) flags, no lookarounds); snippet patterns use re.
+# The email local part and domain labels are length-capped to bound each match.
+# Only target-domain emails are kept, so the domain is baked into the email
+# pattern with TARGET_EMAIL_TEMPLATE.format(domain=re.escape(base_domain)).
+# Group 1 is the address; group 2 catches look-alikes (duet.edu.pk.evil.com,
+# duet.edu.pk-x) that a lookahead would otherwise have to reject.
+TARGET_EMAIL_TEMPLATE = r'\b([A-Za-z0-9._%+-]{{1,64}}@(?:[A-Za-z0-9-]{{1,63}}\.){{0,8}}{domain})\b(\.[A-Za-z0-9]|-)?'
+HREF_RE = re_engine.compile(r'''href=['"]?([^'" >]+)''')
+NAME_RE = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+# (?![A-Za-z]) rather than a closing \b, which can't match after 'Dr.' and would trim it to 'Dr'
+ROLE_RE = re.compile(r'\b(Professor|Dr\.?|Lecturer|Engineer|Director|Manager|Head|Coordinator|Researcher)(?![A-Za-z])', re.IGNORECASE)
+DEPT_RE = re.compile(r'\b(Computer Science|Electrical|Mechanical|Civil|IT|Library|Admissions)\b', re.IGNORECASE)
+
+def _valid_local_part(email: str) -> bool:
+    """Reject RFC-illegal dots in the local part (leading, trailing or doubled)"""
+    local = email.split('@', 1)[0]
+    return not (local.startswith('.') or local.endswith('.') or '..' in local)
+
+def _write_json(path: str, obj) -> None:
+    """Indented JSON export, through orjson when available"""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+def url_fingerprint(url: str) -> int:
+    """64-bit fingerprint kept in visited/document sets instead of the full URL"""
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(url.encode())
+    return int.from_bytes(blake2b(url.encode(), digest_size=8).digest(), 'big')
+
+def _extract_hrefs(html) -> List[str]:
+    """All <a href> values in one DOM parse, regex fallback without selectolax"""
+    if HTMLParser is not None:
+        hrefs = (node.attributes.get('href') for node in HTMLParser(html).css('a[href]'))
+        return [href.strip() for href in hrefs if href]
+    return HREF_RE.findall(html)
+
+def _ooxml_xml(data: bytes, prefix: str) -> bytes:
+    """Raw XML of the parts of an in-memory .docx/.pptx whose names start with prefix"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return b"\n".join(archive.read(name) for name in archive.namelist()
+                          if name.startswith(prefix) and name.endswith('.xml'))
+
+async def _block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
 
 # =============== INTELLIGENCE CORE ===============
 class NexusHarvester:
@@ -39,41 +158,47 @@ class NexusHarvester:
         self.base_domain = urlparse(root_url).netloc.lower()
         if self.base_domain.startswith('www.'):
             self.base_domain = self.base_domain[4:]
+        self._dot_base = '.' + self.base_domain
+        email_pattern = '(?i)' + TARGET_EMAIL_TEMPLATE.format(domain=re.escape(self.base_domain))
+        self.email_re = re_engine.compile(email_pattern)
+        self.email_re_b = re_engine.compile(email_pattern.encode())  # documents are scanned as raw bytes
         
         # Intelligence database
         self.emails: Dict[str, Dict] = {}  # email -> {name, role, dept, source}
-        self.visited: Set[str] = set()
-        self.documents: Set[str] = set()
+        self.visited: Set[int] = set()  # url_fingerprint() of each claimed canonical URL
+        self.documents: Set[int] = set()
         self.pages = 0
         self.session = None
         self.browser = None
+        self.context_pool: asyncio.Queue = asyncio.Queue()  # (context, pages served)
+        self._browser_lock = asyncio.Lock()
+        self._doc_sem = asyncio.Semaphore(DOC_CONCURRENT)
 
     # ==================== 1. AI-Powered Context Intelligence ====================
-    def extract_context(self, text: str, email: str) -> Dict:
+    def extract_context(self, lines: List[str], lines_lower: List[str], email: str) -> Dict:
         """Extract name, role, department near email using patterns + heuristics"""
-        lines = text.split('\n')
         context = {"name": "", "role": "", "department": "", "confidence": 0.5}
         
-        # Find line with email
-        for i, line in enumerate(lines):
-            if email in line.lower():
+        # Find line with email (lines_lower is built once per page by the caller)
+        for i, line in enumerate(lines_lower):
+            if line.find(email) != -1:
                 # Look in nearby lines (±3)
                 snippet = " ".join(lines[max(0, i-3):i+4])
                 
                 # Extract name (capitalized words near email)
-                name_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', snippet)
+                name_match = NAME_RE.search(snippet)
                 if name_match:
                     context["name"] = name_match.group(1)
                     context["confidence"] = max(context["confidence"], 0.8)
                 
                 # Role keywords
-                roles = re.findall(r'(Professor|Dr\.?|Lecturer|Engineer|Director|Manager|Head|Coordinator|Researcher)', snippet, re.IGNORECASE)
+                roles = ROLE_RE.findall(snippet)
                 if roles:
                     context["role"] = roles[0]
                     context["confidence"] = max(context["confidence"], 0.9)
                 
                 # Departments (common in universities)
-                depts = re.findall(r'(Computer Science|Electrical|Mechanical|Civil|IT|Library|Admissions)', snippet, re.IGNORECASE)
+                depts = DEPT_RE.findall(snippet)
                 if depts:
                     context["department"] = depts[0]
                     context["confidence"] = max(context["confidence"], 0.85)
@@ -88,9 +213,10 @@ class NexusHarvester:
         try:
             # crt.sh (certificate transparency)
             url = f"https://crt.sh/?q=%.{self.base_domain}&output=json"
-            async with self.session.get(url) as resp:
+            async with self.session.get(url, headers={"User-Agent": random.choice(USER_AGENTS)}) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    body = await resp.read()
+                    data = orjson.loads(body) if orjson is not None else json.loads(body)
                     for entry in data:
                         name = entry.get('name_value', '').lower()
                         if name.endswith(self.base_domain) and '*' not in name:
@@ -105,126 +231,173 @@ class NexusHarvester:
         return list(subdomains)[:MAX_SUBDOMAINS]
 
     # ==================== 3. Document Miner (PDF/DOCX) ====================
-    async def download_document(self, url: str) -> str:
-        """Download document and save temporarily"""
+    async def download_document(self, url: str) -> Optional[bytes]:
+        """Download document straight into memory (b"" if over MAX_DOC_BYTES); None if the request itself failed"""
         try:
-            async with self.session.get(url) as resp:
-                if resp.status == 200:
-                    ext = Path(urlparse(url).path).suffix.lower()
-                    if ext in DOCUMENT_EXTENSIONS:
-                        filename = f"/tmp/doc_{abs(hash(url))}{ext}"
-                        with open(filename, 'wb') as f:
-                            f.write(await resp.read())
-                        return filename
-        except:
-            pass
-        return ""
+            async with self._doc_sem:
+                async with self.session.get(url, headers={"User-Agent": random.choice(USER_AGENTS)},
+                                            timeout=DOC_TIMEOUT) as resp:
+                    if resp.status == 200:
+                        if (resp.content_length or 0) > MAX_DOC_BYTES:
+                            return b""
+                        buf = io.BytesIO()
+                        async for chunk in resp.content.iter_chunked(DOC_CHUNK):
+                            if buf.tell() + len(chunk) > MAX_DOC_BYTES:
+                                return b""
+                            buf.write(chunk)
+                        return buf.getvalue()
+        except Exception:
+            return None
+        return b""
 
-    def extract_emails_from_doc(self, filepath: str) -> Set[str]:
-        """Extract emails from PDF/DOCX"""
+    async def extract_emails_from_doc(self, data: bytes, ext: str) -> Set[str]:
+        """Extract emails from PDF/DOCX bytes without touching disk or decoding the text"""
         emails = set()
         try:
-            if filepath.endswith('.pdf'):
-                # Use pdftotext (must install: apt install poppler-utils)
-                result = subprocess.run(['pdftotext', '-layout', filepath, '-'], 
-                                      capture_output=True, text=True)
-                text = result.stdout
-            elif filepath.endswith(('.doc', '.docx', '.ppt', '.pptx')):
-                # Use antiword or catdoc (fallback to strings)
-                result = subprocess.run(['strings', filepath], capture_output=True, text=True)
-                text = result.stdout
-            else:
-                return emails
+            raw = None
+            if ext == '.pdf':
+                # pdftotext reads the PDF from stdin (must install: apt install poppler-utils)
+                try:
+                    proc = await asyncio.create_subprocess_exec(
+                        'pdftotext', '-layout', '-', '-',
+                        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL
+                    )
+                    raw, _ = await proc.communicate(data)
+                except FileNotFoundError:
+                    pass
+            elif ext in OOXML_TEXT_PARTS:
+                try:
+                    raw = _ooxml_xml(data, OOXML_TEXT_PARTS[ext])
+                except zipfile.BadZipFile:
+                    pass
+            if raw is None:
+                # Raw byte scan for legacy .doc/.ppt or missing tools
+                raw = data
             
-            std_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-            for email in std_emails:
-                if self.is_target_domain(email):
-                    emails.add(email.lower())
+            for match, tail in self.email_re_b.findall(raw):
+                if not tail:
+                    email = match.decode('ascii').lower()
+                    if _valid_local_part(email):
+                        emails.add(email)
         except Exception as e:
             print(f"Doc extraction error: {str(e)[:50]}")
-        finally:
-            if os.path.exists(filepath):
-                os.remove(filepath)
         return emails
 
+    async def _download_and_parse(self, url: str, doc_fp: int) -> Tuple[str, Set[str]]:
+        data = await self.download_document(url)
+        if data is None:
+            # Transient failure: forget the URL so a later page can retry it
+            self.documents.discard(doc_fp)
+            return url, set()
+        if not data:
+            return url, set()
+        return url, await self.extract_emails_from_doc(data, Path(urlparse(url).path).suffix.lower())
+
     # ==================== 4. Evasion Engine ====================
     async def init_browser(self):
         """Stealth browser with advanced evasion"""
         pw = await async_playwright().start()
-        self.browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--disable-web-security",
-                "--no-sandbox",
-                "--disable-features=IsolateOrigins,site-per-process",
-                "--disable-extensions",
-                "--disable-plugins",
-                "--disable-images"  # Faster
-            ]
+        if SHARED_CDP:
+            self.browser = await pw.chromium.connect_over_cdp(SHARED_CDP)
+        else:
+            self.browser = await pw.chromium.launch(headless=True, args=list(LAUNCH_ARGS))
+        # Always CONCURRENT slots; a slot whose context failed to open stays
+        # empty (None) and is rebuilt by the next fetch that takes it
+        for _ in range(CONCURRENT):
+            try:
+                context = await self._new_context()
+            except Exception as e:
+                print(f"⚠️  Browser context failed to open: {str(e)[:60]}")
+                context = None
+            self.context_pool.put_nowait((context, 0))
+
+    async def _new_context(self):
+        """Fresh stealth context with heavy resources blocked"""
+        context = await self.browser.new_context(
+            user_agent=random.choice(BROWSER_USER_AGENTS),
+            viewport={"width": random.randint(1024, 1920), "height": random.randint(768, 1080)},
+            locale="en-US",
+            timezone_id="America/New_York",
+            permissions=["geolocation"]
         )
+        await context.add_init_script(INIT_SCRIPT)
+        await context.route("**/*", _block_heavy_resources)
+        return context
+
+    async def _release_context(self, context, uses: int):
+        """Return a slot to the pool, closing its context every CONTEXT_RECYCLE_PAGES pages"""
+        # Only a context that is still open goes back; closed or broken ones
+        # leave the slot empty so the next fetch opens a fresh context
+        if context is not None:
+            try:
+                if uses >= CONTEXT_RECYCLE_PAGES:
+                    await context.close()
+                    context = None
+                else:
+                    await context.clear_cookies()
+            except Exception:
+                context = None
+        self.context_pool.put_nowait((context, uses if context is not None else 0))
 
     async def fetch_with_evasion(self, url: str) -> str:
         """Fetch with anti-detection + retry"""
-        if not self.browser:
-            await self.init_browser()
-        
+        async with self._browser_lock:
+            if not self.browser:
+                await self.init_browser()
+
         for attempt in range(2):
-            context = await self.browser.new_context(
-                user_agent=random.choice([
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15"
-                ]),
-                viewport={"width": random.randint(1024, 1920), "height": random.randint(768, 1080)},
-                locale="en-US",
-                timezone_id="America/New_York",
-                permissions=["geolocation"]
-            )
-            
-            # Critical evasion scripts
-            await context.add_init_script("""
-                delete navigator.__proto__.webdriver;
-                window.chrome = { runtime: {} };
-                Object.defineProperty(navigator, 'permissions', { get: () => ({ query: Promise.resolve({ state: 'granted' }) }) });
-                Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-                Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
-            """)
-            
-            page = await context.new_page()
+            context, uses = await self.context_pool.get()
             try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=TIMEOUT*1000)
-                await page.wait_for_timeout(random.uniform(1000, 3000))
-                content = await page.content()
-                return content
+                if context is None:
+                    context = await self._new_context()
+                page = await context.new_page()
+                try:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=TIMEOUT*1000)
+                    await page.wait_for_timeout(random.uniform(1000, 3000))
+                    content = await page.content()
+                    return content
+                finally:
+                    await page.close()
             except Exception as e:
                 if attempt == 1:
                     print(f"🛡️  Evasion failed for {url}: {str(e)[:60]}")
                 await asyncio.sleep(2)
             finally:
-                await context.close()
+                await self._release_context(context, uses + 1)
         return ""
 
     # ==================== CORE SCRAPE LOGIC ====================
-    def is_target_domain(self, email: str) -> bool:
-        if '@' not in email:
-            return False
-        _, domain = email.lower().rsplit('@', 1)
-        return domain == self.base_domain or domain.endswith('.' + self.base_domain)
+    def _canon(self, url: str) -> str:
+        """Dedup key only: lowercase host, no fragment/tracking keys/trailing slash.
+        Pages are still fetched and joined against the URL as linked."""
+        parts = urlsplit(url)
+        query = '&'.join(p for p in parts.query.split('&')
+                         if p.partition('=')[0] not in TRACKING_PARAMS and not p.startswith('utm_'))
+        path = parts.path.rstrip('/') or '/'
+        return urlunsplit((parts.scheme, parts.netloc.lower(), path, query, ''))
+
+    def _claim(self, url: str) -> bool:
+        """Mark a URL's canonical key as visited; False if it already was (one set op, no await)"""
+        before = len(self.visited)
+        self.visited.add(url_fingerprint(self._canon(url)))
+        return len(self.visited) != before
 
     def extract_and_clean_emails(self, text: str) -> Set[str]:
         # (Same advanced logic as before - de-obfuscation included)
         emails = set()
-        std_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        for email in std_emails:
-            if self.is_target_domain(email):
-                emails.add(email.lower())
+        for match, tail in self.email_re.findall(text):
+            if not tail:
+                email = match.lower()
+                if _valid_local_part(email):
+                    emails.add(email)
         # Add de-obfuscation here if needed
         return emails
 
     async def scrape_page(self, url: str):
-        if url in self.visited or self.pages >= MAX_PAGES:
+        # url is already claimed in visited (by its canonical key) by whoever enqueued it
+        if self.pages >= MAX_PAGES:
             return []
-        self.visited.add(url)
         self.pages += 1
         print(f"[{self.pages}] 🕵️ {url}")
 
@@ -234,10 +407,13 @@ class NexusHarvester:
             return []
 
         # Extract emails + context
-        new_emails = self.extract_and_clean_emails(html)
+        new_emails = self.extract_and_clean_emails(html) - self.emails.keys()
+        if new_emails:
+            lines = html.split('\n')
+            lines_lower = html.lower().split('\n')
         for email in new_emails:
             if email not in self.emails:
-                context = self.extract_context(html, email)
+                context = self.extract_context(lines, lines_lower, email)
                 self.emails[email] = {
                     "name": context["name"],
                     "role": context["role"],
@@ -246,38 +422,49 @@ class NexusHarvester:
                     "source": url
                 }
 
+        # One DOM parse feeds both document and navigation links
+        hrefs = _extract_hrefs(html)
+
         # Find document links
-        doc_links = re.findall(r'href=[\'"]?([^\'" >]+\.(pdf|docx?|pptx?))', html, re.IGNORECASE)
-        for link, _ in doc_links:
+        doc_links = [h for h in hrefs if urlparse(h).path.lower().endswith(DOC_SUFFIXES)]
+        new_docs = []
+        for link in doc_links:
             full_url = urljoin(url, link)
-            if full_url not in self.documents:
-                self.documents.add(full_url)
-                doc_path = await self.download_document(full_url)
-                if doc_path:
-                    doc_emails = self.extract_emails_from_doc(doc_path)
-                    for email in doc_emails:
-                        if email not in self.emails:
-                            self.emails[email] = {
-                                "name": "", "role": "", "department": "",
-                                "confidence": 0.6, "source": full_url
-                            }
+            doc_fp = url_fingerprint(self._canon(full_url))
+            if doc_fp not in self.documents:
+                self.documents.add(doc_fp)
+                new_docs.append((full_url, doc_fp))
+        # Download + parse this page's documents concurrently (bounded by _doc_sem)
+        results = await asyncio.gather(*(self._download_and_parse(u, fp) for u, fp in new_docs),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                continue
+            doc_url, doc_emails = result
+            for email in doc_emails:
+                if email not in self.emails:
+                    self.emails[email] = {
+                        "name": "", "role": "", "department": "",
+                        "confidence": 0.6, "source": doc_url
+                    }
 
         # Extract next links
+        # (claimed at enqueue; stops once MAX_PAGES URLs have been claimed)
         next_urls = []
-        if self.pages < MAX_PAGES:
-            links = re.findall(r'href=[\'"]?([^\'" >]+)', html)
-            for raw in links:
-                if raw.startswith(('http://', 'https://')):
-                    full = raw
-                elif raw.startswith('/'):
-                    full = urljoin(url, raw)
-                else:
-                    continue
-                parsed = urlparse(full)
-                domain = parsed.netloc.lower()
-                if domain == self.base_domain or domain.endswith('.' + self.base_domain):
-                    if full not in self.visited:
-                        next_urls.append(full)
+        for raw in hrefs:
+            if len(self.visited) >= MAX_PAGES:
+                break
+            if raw.startswith(('http://', 'https://')):
+                full = raw
+            elif raw.startswith('/'):
+                full = urljoin(url, raw)
+            else:
+                continue
+            parsed = urlparse(full)
+            domain = parsed.netloc.lower()
+            if domain == self.base_domain or domain.endswith(self._dot_base):
+                if self._claim(full):
+                    next_urls.append(full)
         return next_urls
 
     async def crawl(self):
@@ -290,32 +477,45 @@ class NexusHarvester:
         for path in SENSITIVE_PATHS:
             start_urls.append(urljoin(self.root_url, path))
         
-        queue = deque(start_urls)
-        tasks = set()
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in start_urls:
+            if self._claim(url):
+                queue.put_nowait(url)
         
-        while (queue or tasks) and self.pages < MAX_PAGES:
-            while queue and len(tasks) < CONCURRENT:
-                url = queue.popleft()
-                task = asyncio.create_task(self._worker(url, queue))
-                tasks.add(task)
-                task.add_done_callback(tasks.discard)
-            await asyncio.sleep(0.05)
+        # Fixed pool of long-lived workers; join() returns once nothing is queued or in flight
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(CONCURRENT)]
+        await queue.join()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
         
         print(f"\n🎯 Intelligence gathered: {len(self.emails)} profiles from {self.pages} assets.")
 
-    async def _worker(self, url: str, queue: deque):
-        next_urls = await self.scrape_page(url)
-        for u in next_urls:
-            queue.append(u)
-        await asyncio.sleep(random.uniform(*DELAY))
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            url = await queue.get()
+            try:
+                for u in await self.scrape_page(url):
+                    queue.put_nowait(u)
+                await asyncio.sleep(random.uniform(*DELAY))
+            except Exception as e:
+                print(f"⚠️  Worker error on {url[:60]}: {str(e)[:60]}")
+            finally:
+                queue.task_done()
 
     async def init_session(self):
+        # One pooled session for the whole crawl; UA rotates per request, not per session
+        connector = aiohttp.TCPConnector(
+            limit=CONCURRENT * 2,
+            limit_per_host=CONCURRENT,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=30,
+            ssl=False
+        )
         self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=TIMEOUT),
-            headers={"User-Agent": random.choice([
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
-            ])}
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT, connect=3, sock_read=TIMEOUT)
         )
 
     async def close(self):
@@ -330,12 +530,11 @@ class NexusHarvester:
         timestamp = int(time.time())
         
         # Full intelligence JSON
-        with open(f"intel_{clean}_{timestamp}.json", "w") as f:
-            json.dump({
-                "domain": self.base_domain,
-                "total": len(self.emails),
-                "profiles": self.emails
-            }, f, indent=2)
+        _write_json(f"intel_{clean}_{timestamp}.json", {
+            "domain": self.base_domain,
+            "total": len(self.emails),
+            "profiles": self.emails
+        })
         
         # Hunter.io compatible
         with open(f"emails_{clean}_{timestamp}.csv", "w", newline="") as f:
@@ -367,4 +566,7 @@ async def main():
         await harvester.close()
 
 if __name__ == "__main__":
+    # The policy has to be in place before asyncio.run() creates the loop
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())